@@ -136,7 +136,7 @@ class Arrow:
             if scan != cod:
                 raise AxiomError(messages.does_not_compose(
                     boxes[-1] if boxes else Id(dom), Id(cod)))
-        self._dom, self._cod, self._boxes = dom, cod, boxes
+        self._dom, self._cod, self._boxes = dom, cod, tuple(boxes)
 
     @property
     def dom(self):
@@ -179,28 +179,28 @@ class Arrow:
         return list(self._boxes)
 
     def __iter__(self):
-        for box in self.boxes:
+        for box in self._boxes:
             yield box
 
     def __getitem__(self, key):
         if isinstance(key, slice):
             if key.step == -1:
-                boxes = [box[::-1] for box in self.boxes[key]]
+                boxes = [box[::-1] for box in self._boxes[key]]
                 return Arrow(self.cod, self.dom, boxes, _scan=False)
             if (key.step or 1) != 1:
                 raise IndexError
-            boxes = self.boxes[key]
+            boxes = self._boxes[key]
             if not boxes:
                 if (key.start or 0) >= len(self):
                     return Id(self.cod)
                 if (key.start or 0) <= -len(self):
                     return Id(self.dom)
-                return Id(self.boxes[key.start or 0].dom)
+                return Id(self._boxes[key.start or 0].dom)
             return Arrow(boxes[0].dom, boxes[-1].cod, boxes, _scan=False)
-        return self.boxes[key]
+        return self._boxes[key]
 
     def __len__(self):
-        return len(self.boxes)
+        return len(self._boxes)
 
     def __repr__(self):
         if not self.boxes:  # i.e. self is identity.
@@ -407,7 +407,7 @@ class Box(Arrow):
         if not str(name):
             raise ValueError(messages.empty_name(name))
         self._name, self._dom, self._cod = name, dom, cod
-        self._boxes, self._dagger, self._data = [self], _dagger, data
+        self._dagger, self._data = _dagger, data
         Arrow.__init__(self, dom, cod, [self], _scan=False)
 
     @property
@@ -216,8 +216,7 @@ def draw(diagram, axis=None, data=None, **params):
                 node_color=params.get('color', '#ff0000'), ax=axis)
             if params.get('draw_box_labels', True):
                 nx.draw_networkx_labels(
-                    graph, positions,
-                    {n: l for n, l in labels.items() if n in nodes})
+                    graph, positions, {n: labels[n] for n in nodes})
 
     def draw_box(axis, box, depth):
         node = 'box_{}'.format(depth)
@@ -272,8 +271,8 @@ def draw(diagram, axis=None, data=None, **params):
                                                 params.get('fontsize', None)),
                             verticalalignment='top')
         for source, target in graph.edges():
-            if "box" in [source[:3], target[:3]] and not any(
-                    n in [source, target] for n in params['draw_as_nodes']):
+            if "box" in [source[:3], target[:3]]\
+                    and source not in as_nodes and target not in as_nodes:
                 continue
             draw_wire(axis, positions[source], positions[target],
                       bend_out='box' in source, bend_in='box' in target,
@@ -286,10 +285,11 @@ def draw(diagram, axis=None, data=None, **params):
     params['draw_as_nodes'] = [
         'box_{}'.format(i) for i in params.get('draw_as_nodes', [])
         if 'box_{}'.format(i) in graph.nodes]
+    as_nodes = set(params['draw_as_nodes'])
     draw_wires(axis)
     draw_nodes(axis, params['draw_as_nodes'])
     for depth, box in enumerate(diagram.boxes):
-        if 'box_{}'.format(depth) in params['draw_as_nodes']:
+        if 'box_{}'.format(depth) in as_nodes:
             continue
         draw_box(axis, box, depth)
     if params.get('to_tikz', False):
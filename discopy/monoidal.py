@@ -114,7 +114,7 @@ class Ty(Ob):
         Ty('x', 'x', 'x')
 
         """
-        return Ty(*(self.objects + other.objects))
+        return Ty(*(self._objects + other._objects))
 
     def __init__(self, *objects):
         self._objects = tuple(
@@ -136,7 +136,7 @@ class Ty(Ob):
         return ' @ '.join(map(str, self)) or 'Ty()'
 
     def __len__(self):
-        return len(self.objects)
+        return len(self._objects)
 
     def __iter__(self):
         for i in range(len(self)):
@@ -144,8 +144,8 @@ class Ty(Ob):
 
     def __getitem__(self, key):
         if isinstance(key, slice):
-            return Ty(*self.objects[key])
-        return self.objects[key]
+            return Ty(*self._objects[key])
+        return self._objects[key]
 
     def __matmul__(self, other):
         return self.tensor(other)
@@ -278,17 +278,22 @@ class Diagram(cat.Arrow):
         if len(boxes) != len(offsets):
             raise ValueError(messages.boxes_and_offsets_must_have_same_len())
         if layers is None:
-            layers = cat.Id(dom)
+            layers, scan = [], dom
             for box, off in zip(boxes, offsets):
                 if not isinstance(box, Diagram):
                     raise TypeError(messages.type_err(Diagram, box))
                 if not isinstance(off, int):
                     raise TypeError(messages.type_err(int, off))
-                left = layers.cod[:off] if layers else dom[:off]
-                right = layers.cod[off + len(box.dom):]\
-                    if layers else dom[off + len(box.dom):]
-                layers = layers >> Layer(left, box, right)
-            layers = layers >> cat.Id(cod)
+                layer = Layer(scan[:off], box, scan[off + len(box.dom):])
+                if layer.dom != scan:
+                    raise AxiomError(messages.does_not_compose(
+                        cat.Arrow(dom, scan, layers, _scan=False), layer))
+                layers.append(layer)
+                scan = layer.cod
+            if scan != cod:
+                raise AxiomError(messages.does_not_compose(
+                    cat.Arrow(dom, scan, layers, _scan=False), cat.Id(cod)))
+            layers = cat.Arrow(dom, cod, layers, _scan=False)
         self._layers, self._offsets = layers, tuple(offsets)
         super().__init__(dom, cod, boxes, _scan=False)
 
@@ -444,7 +449,7 @@ class Diagram(cat.Arrow):
             return result
         if j < i:
             i, j = j, i
-        off0, off1 = self.offsets[i], self.offsets[j]
+        off0, off1 = self._offsets[i], self._offsets[j]
         left0, box0, right0 = self.layers[i]
         left1, box1, right1 = self.layers[j]
         # By default, we check if box0 is to the right first, then to the left.
@@ -465,8 +470,8 @@ class Diagram(cat.Arrow):
             layer1 = Layer(left0 @ box0.dom @ middle, box1, right1)
         else:
             raise InterchangerError(box0, box1)
-        boxes = self.boxes[:i] + [box1, box0] + self.boxes[i + 2:]
-        offsets = self.offsets[:i] + [off1, off0] + self.offsets[i + 2:]
+        boxes = self._boxes[:i] + (box1, box0) + self._boxes[i + 2:]
+        offsets = self._offsets[:i] + (off1, off0) + self._offsets[i + 2:]
         layers = self.layers[:i] >> layer1 >> layer0 >> self.layers[i + 2:]
         return Diagram(self.dom, self.cod, boxes, offsets, layers=layers)
 
@@ -498,8 +503,8 @@ class Diagram(cat.Arrow):
         while True:
             no_more_moves = True
             for i in range(len(diagram) - 1):
-                box0, box1 = diagram.boxes[i], diagram.boxes[i + 1]
-                off0, off1 = diagram.offsets[i], diagram.offsets[i + 1]
+                box0, box1 = diagram._boxes[i], diagram._boxes[i + 1]
+                off0, off1 = diagram._offsets[i], diagram._offsets[i + 1]
                 if left and off1 >= off0 + len(box0.cod)\
                         or not left and off0 >= off1 + len(box1.dom):
                     diagram = diagram.interchange(i, i + 1, left=left)
@@ -567,8 +572,8 @@ class Diagram(cat.Arrow):
         >>> assert next(a) == kets
         """
         def is_right_of(last, diagram):
-            off0, off1 = diagram.offsets[last], diagram.offsets[last + 1]
-            box0, box1 = diagram.boxes[last], diagram.boxes[last + 1]
+            off0, off1 = diagram._offsets[last], diagram._offsets[last + 1]
+            box0, box1 = diagram._boxes[last], diagram._boxes[last + 1]
             if off1 >= off0 + len(box0.cod):  # box1 right of box0
                 return True
             if off0 >= off1 + len(box1.dom):  # box1 left of box0
@@ -13,17 +13,66 @@ The objects are given by the free pregroup, the arrows by planar diagrams.
 >>> assert left_snake.normal_form() == Id(n) == right_snake.normal_form()
 """
 
+import copyreg
+import os
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from weakref import WeakValueDictionary
+
+import numpy as np
+
 from discopy import cat, monoidal, messages
 from discopy.cat import AxiomError
 
 
+_OB_CACHE = WeakValueDictionary()
+
+_NF_CACHE, _NF_CACHE_SIZE = OrderedDict(), 4096
+
+_PLAN_CACHE_SIZE = 4096
+
+# Below this many boxes, compiling _yank_plan with numba does not pay off.
+_JIT_MIN_BOXES = 128
+
+_JIT = {}  # The compiled _yank_plan and the numba errors, set on first use.
+
+
 class Ob(cat.Ob):
     """
     Implements simple pregroup types: basic types and their iterated adjoints.
 
     >>> a = Ob('a')
     >>> assert a.l.r == a.r.l == a and a != a.l.l != a.r.r
+
+    Simple types with hashable names are interned, i.e. there is at most one
+    instance alive for each pair of name and winding number.
+
+    >>> assert Ob('a', z=1) is a.r is a.l.r.r
     """
+    __slots__ = ('_name', '_z', '_hash', '_str', '_repr', '_initialized')
+
+    def __new__(cls, *args, **params):
+        if cls is not Ob:
+            return super().__new__(cls)
+        name = args[0] if args else params.get('name', None)
+        z = args[1] if len(args) > 1 else params.get('z', 0)
+        if not isinstance(z, int):  # e.g. 1.0 would find Ob(name, z=1).
+            raise TypeError(messages.type_err(int, z))
+        try:
+            key = (type(name), name, type(z), z)
+            result = _OB_CACHE.get(key)
+        except TypeError:  # unhashable names are not interned.
+            return super().__new__(cls)
+        if result is None:
+            result = _OB_CACHE[key] = super().__new__(cls)
+        return result
+
+    def __reduce__(self):
+        # No state is restored, hashes are salted per process.
+        return type(self), (self.name, self.z)
+
     @property
     def z(self):
         """ Winding number """
@@ -40,12 +89,23 @@ class Ob(cat.Ob):
         return Ob(self.name, self.z + 1)
 
     def __init__(self, name, z=0):
+        if getattr(self, '_initialized', False):
+            return
         if not isinstance(z, int):
             raise TypeError(messages.type_err(int, z))
-        self._z = z
+        self._z, self._str, self._repr = z, None, None
         super().__init__(name)
+        try:
+            self._hash = hash(name if not z else (name, z))
+        except TypeError:
+            self._hash = None
+        self._initialized = True
 
     def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is Ob:  # fast path, winding numbers are cheaper.
+            return self._z == other._z and self._name == other._name
         if not isinstance(other, Ob):
             if isinstance(other, cat.Ob):
                 return self.z == 0 and self.name == other.name
@@ -53,15 +113,21 @@ class Ob(cat.Ob):
         return (self.name, self.z) == (other.name, other.z)
 
     def __hash__(self):
-        return hash(self.name if not self.z else (self.name, self.z))
+        if self._hash is None:
+            return hash(self.name if not self.z else (self.name, self.z))
+        return self._hash
 
     def __repr__(self):
-        return "Ob({}{})".format(
-            repr(self.name), ", z=" + repr(self.z) if self.z else '')
+        if self._repr is None:
+            self._repr = "Ob({}{})".format(
+                repr(self.name), ", z=" + repr(self.z) if self.z else '')
+        return self._repr
 
     def __str__(self):
-        return str(self.name) + (
-            - self.z * '.l' if self.z < 0 else self.z * '.r')
+        if self._str is None:
+            self._str = str(self.name) + (
+                - self.z * '.l' if self.z < 0 else self.z * '.r')
+        return self._str
 
 
 class Ty(monoidal.Ty, Ob):
@@ -70,32 +136,85 @@ class Ty(monoidal.Ty, Ob):
     >>> s, n = Ty('s'), Ty('n')
     >>> assert n.l.r == n == n.r.l
     >>> assert (s @ n).l == n.l @ s.l and (s @ n).r == n.r @ s.r
+
+    Adjoints are computed once and cached, types being immutable.
+
+    >>> t = s @ n
+    >>> assert t.l is t.l and t.l.r is t
     """
+    __slots__ = ('_objects', '_l', '_r', '_ty_hash')
+
     @property
     def l(self):
         """ Left adjoint. """
-        return Ty(*[x.l for x in self.objects[::-1]])
+        if self._l is None:
+            self._l = Ty._unchecked(
+                tuple(x.l for x in reversed(self._objects)))
+            self._l._r = self
+        return self._l
 
     @property
     def r(self):
         """ Right adjoint. """
-        return Ty(*[x.r for x in self.objects[::-1]])
+        if self._r is None:
+            self._r = Ty._unchecked(
+                tuple(x.r for x in reversed(self._objects)))
+            self._r._l = self
+        return self._r
 
     def tensor(self, other):
+        if isinstance(other, Ty):
+            return Ty._unchecked(self._objects + other._objects)
         return Ty(*super().tensor(other))
 
     def __init__(self, *t):
         t = [x if isinstance(x, Ob)
              else Ob(x.name) if isinstance(x, cat.Ob)
              else Ob(x) for x in t]
+        self._l, self._r, self._ty_hash = None, None, None
         monoidal.Ty.__init__(self, *t)
         Ob.__init__(self, str(self))
 
+    @staticmethod
+    def _unchecked(objects):
+        """
+        Builds a type from a tuple of :class:`rigid.Ob` without checking it.
+
+        >>> x, y = Ob('x'), Ob('y', z=1)
+        >>> assert Ty._unchecked((x, y)) == Ty('x', Ob('y', z=1))
+        """
+        result = Ty.__new__(Ty)
+        result._l, result._r, result._ty_hash = None, None, None
+        result._objects = objects
+        Ob.__init__(result, str(result))
+        return result
+
     def __getitem__(self, key):
         if isinstance(key, slice):
-            return Ty(*super().__getitem__(key))
+            return Ty._unchecked(self._objects[key])
         return super().__getitem__(key)
 
+    def __hash__(self):
+        if self._ty_hash is None:
+            self._ty_hash = hash(repr(self))
+        return self._ty_hash
+
+    def __reduce__(self):
+        return copyreg.__newobj__, (type(self), ), self.__getstate__()
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        state.update({attr: getattr(self, attr)
+                      for attr in Ob.__slots__ + Ty.__slots__
+                      if hasattr(self, attr)})
+        # Hashes are salted per process, they are recomputed with adjoints.
+        state.update(_hash=None, _ty_hash=None, _l=None, _r=None)
+        return state
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     def __repr__(self):
         return "Ty({})".format(', '.join(
             repr(x if x.z else x.name) for x in self.objects))
@@ -126,13 +245,18 @@ class Diagram(monoidal.Diagram):
     >>> print(Diagram(Alice.dom @ jokes.dom, s, boxes, offsets))
     Alice >> Id(n) @ jokes >> Cup(n, n.r) @ Id(s)
     """
+    __slots__ = ('_dom', '_cod', '_boxes', '_offsets', '_layers')
+
     @staticmethod
     def _upgrade(diagram):
         """
         Takes a monoidal.Diagram and returns a rigid.Diagram.
         """
-        return Diagram(Ty(*diagram.dom), Ty(*diagram.cod),
-                       diagram.boxes, diagram.offsets, layers=diagram.layers)
+        dom, cod = diagram.dom, diagram.cod
+        dom = dom if type(dom) is Ty else Ty(*dom)
+        cod = cod if type(cod) is Ty else Ty(*cod)
+        return Diagram(dom, cod, diagram.boxes, diagram.offsets,
+                       layers=diagram.layers)
 
     @staticmethod
     def id(x):
@@ -202,12 +326,19 @@ class Diagram(monoidal.Diagram):
             raise TypeError(messages.type_err(Ty, left))
         if not isinstance(right, Ty):
             raise TypeError(messages.type_err(Ty, right))
-        cups = Id(left @ right)
+        dom, cod = left @ right, right[len(left):]
+        head = right[:len(left)]
+        factory = Cup._unchecked\
+            if head == left.r and left != head.r else Cup
+        boxes, offsets, layers = [], [], []
         for i in range(len(left)):
             j = len(left) - i - 1
-            cup = Cup(left[j:j + 1], right[i:i + 1])
-            cups = cups >> Id(left[:j]) @ cup @ Id(right[i + 1:])
-        return cups
+            cup = factory(left[j:j + 1], right[i:i + 1])
+            boxes.append(cup)
+            offsets.append(j)
+            layers.append(monoidal.Layer(left[:j], cup, right[i + 1:]))
+        layers = cat.Arrow(dom, cod, layers, _scan=False)
+        return Diagram(dom, cod, boxes, offsets, layers=layers)
 
     @staticmethod
     def caps(left, right):
@@ -222,12 +353,19 @@ class Diagram(monoidal.Diagram):
             raise TypeError(messages.type_err(Ty, left))
         if not isinstance(right, Ty):
             raise TypeError(messages.type_err(Ty, right))
-        caps = Id(left @ right)
-        for i in range(len(left)):
-            j = len(left) - i - 1
-            cap = Cap(left[j:j + 1], right[i:i + 1])
-            caps = caps << Id(left[:j]) @ cap @ Id(right[i + 1:])
-        return caps
+        dom, cod = right[len(left):], left @ right
+        head = right[:len(left)]
+        factory = Cap._unchecked\
+            if head == left.l and left != head.l else Cap
+        boxes, offsets, layers = [], [], []
+        for j in range(len(left)):
+            i = len(left) - j - 1
+            cap = factory(left[j:j + 1], right[i:i + 1])
+            boxes.append(cap)
+            offsets.append(j)
+            layers.append(monoidal.Layer(left[:j], cap, right[i + 1:]))
+        layers = cat.Arrow(dom, cod, layers, _scan=False)
+        return Diagram(dom, cod, boxes, offsets, layers=layers)
 
     def transpose_r(self):
         """
@@ -273,98 +411,17 @@ class Diagram(monoidal.Diagram):
         g >> f[::-1] >> Id(n) @ Cap(n.r, n) >> Cup(n, n.r) @ Id(n) >> f >> h
         g >> f[::-1] >> f >> h
         """
-        def follow_wire(diagram, i, j):
-            """
-            Given a diagram, the index of a box i and the offset j of an output
-            wire, returns (i, j, obstructions) where:
-            - i is the index of the box which takes this wire as input, or
-            len(diagram) if it is connected to the bottom boundary.
-            - j is the offset of the wire at its bottom end.
-            - obstructions is a pair of lists of indices for the boxes on
-            the left and right of the wire we followed.
-            """
-            left_obstruction, right_obstruction = [], []
-            while i < len(diagram) - 1:
-                i += 1
-                box, off = diagram.boxes[i], diagram.offsets[i]
-                if off <= j < off + len(box.dom):
-                    return i, j, (left_obstruction, right_obstruction)
-                if off <= j:
-                    j += len(box.cod) - len(box.dom)
-                    left_obstruction.append(i)
-                else:
-                    right_obstruction.append(i)
-            return len(diagram), j, (left_obstruction, right_obstruction)
-
-        def find_snake(diagram):
-            """
-            Given a diagram, returns (cup, cap, obstructions, left_snake)
-            if there is a yankable pair, otherwise returns None.
-            """
-            for cap in range(len(diagram)):
-                if not isinstance(diagram.boxes[cap], Cap):
-                    continue
-                for left_snake, wire in [(True, diagram.offsets[cap]),
-                                         (False, diagram.offsets[cap] + 1)]:
-                    cup, wire, obstructions =\
-                        follow_wire(diagram, cap, wire)
-                    not_yankable =\
-                        cup == len(diagram)\
-                        or not isinstance(diagram.boxes[cup], Cup)\
-                        or left_snake and diagram.offsets[cup] + 1 != wire\
-                        or not left_snake and diagram.offsets[cup] != wire
-                    if not_yankable:
-                        continue
-                    return cup, cap, obstructions, left_snake
-            return None
-
-        def unsnake(diagram, cup, cap, obstructions, left_snake=False):
-            """
-            Given a diagram and the indices for a cup and cap pair
-            and a pair of lists of obstructions on the left and right,
-            returns a new diagram with the snake removed.
-
-            A left snake is one of the form Id @ Cap >> Cup @ Id.
-            A right snake is one of the form Cap @ Id >> Id @ Cup.
-            """
-            left_obstruction, right_obstruction = obstructions
-            if left_snake:
-                for box in left_obstruction:
-                    diagram = diagram.interchange(box, cap)
-                    yield diagram
-                    for i, right_box in enumerate(right_obstruction):
-                        if right_box < box:
-                            right_obstruction[i] += 1
-                    cap += 1
-                for box in right_obstruction[::-1]:
-                    diagram = diagram.interchange(box, cup)
-                    yield diagram
-                    cup -= 1
-            else:
-                for box in left_obstruction[::-1]:
-                    diagram = diagram.interchange(box, cup)
-                    yield diagram
-                    for i, right_box in enumerate(right_obstruction):
-                        if right_box > box:
-                            right_obstruction[i] -= 1
-                    cup -= 1
-                for box in right_obstruction:
-                    diagram = diagram.interchange(box, cap)
-                    yield diagram
-                    cap += 1
-            boxes = diagram.boxes[:cap] + diagram.boxes[cup + 1:]
-            offsets = diagram.offsets[:cap] + diagram.offsets[cup + 1:]
-            layers = diagram.layers[:cap] >> diagram.layers[cup + 1:]
-            yield Diagram(diagram.dom, diagram.cod, boxes, offsets, layers)
-
         diagram = self
-        while True:
-            yankable = find_snake(diagram)
-            if yankable is None:
-                break
-            for _diagram in unsnake(diagram, *yankable):
-                yield _diagram
-                diagram = _diagram
+        for move, i, j in _snake_plan(self._boxes, self._offsets):
+            if move == _INTERCHANGE:
+                diagram = diagram.interchange(i, j)
+            else:
+                diagram = Diagram(
+                    diagram.dom, diagram.cod,
+                    diagram._boxes[:i] + diagram._boxes[j + 1:],
+                    diagram._offsets[:i] + diagram._offsets[j + 1:],
+                    layers=diagram.layers[:i] >> diagram.layers[j + 1:])
+            yield diagram
         for _diagram in monoidal.Diagram.normalize(diagram, left=left):
             yield _diagram
 
@@ -372,8 +429,235 @@ class Diagram(monoidal.Diagram):
         """
         Implements the normalisation of rigid monoidal categories,
         see arxiv:1601.05372, definition 2.12.
-        """
-        return super().normal_form(normalize=Diagram.normalize, left=left)
+
+        Snakes are removed without building the intermediate diagrams.
+
+        >>> n = Ty('n')
+        >>> diagram = Id(n).transpose_l().transpose_r()
+        >>> *_, last_step = diagram.normalize()
+        >>> assert diagram.normal_form() == last_step == Id(n)
+
+        Normal forms are cached, keyed on the identity of the boxes.
+
+        >>> assert diagram.normal_form() is diagram.normal_form()
+        """
+        key = (type(self), self.dom, tuple(map(id, self._boxes)),
+               self._offsets, left)
+        if key in _NF_CACHE:
+            _NF_CACHE.move_to_end(key)
+            return _NF_CACHE[key][1]
+        result = self._normal_form(left=left)
+        # We keep the boxes alive so that their ids do not get reused.
+        _NF_CACHE[key] = (self._boxes, result)
+        if len(_NF_CACHE) > _NF_CACHE_SIZE:
+            _NF_CACHE.popitem(last=False)
+        return result
+
+    def _normal_form(self, left=False):
+        boxes, offsets = self.boxes, self.offsets
+        _remove_snakes(boxes, offsets)
+        diagram = self if len(boxes) == len(self) else Diagram(
+            self.dom, self.cod, boxes, offsets)
+        try:
+            return monoidal.Diagram.normal_form(diagram, left=left)
+        except NotImplementedError as error:
+            raise NotImplementedError(
+                messages.is_not_connected(self)) from error
+
+
+def _snake_plan(boxes, offsets):
+    """
+    Plans the removal of snakes from a diagram given its boxes and offsets.
+
+    Returns
+    -------
+    plan : list of tuple
+        The rewrite steps, either :code:`(_INTERCHANGE, i, j)` for
+        :meth:`Diagram.interchange` or :code:`(_YANK, cap, cup)` for the
+        removal of boxes cap to cup, see :func:`_yank_plan`.
+    """
+    tags = (list(offsets), [len(box.dom) for box in boxes],
+            [len(box.cod) for box in boxes],
+            [getattr(box, '_kind', 0) for box in boxes])
+    jit, errors = _yank_plan_jit() if len(boxes) >= _JIT_MIN_BOXES\
+        else (None, ())
+    if jit is not None:
+        try:
+            return jit(*(np.array(tag, dtype=np.int64) for tag in tags))
+        except errors:
+            _JIT['plan'] = None  # falls back on _yank_plan from now on.
+    return _yank_plan(*tags)
+
+
+def _yank_plan_jit():
+    """
+    Returns :func:`_yank_plan` compiled with :code:`numba.njit` and the base
+    class of numba errors, or :code:`(None, ())` if numba is not installed.
+    Numba is only imported and the function only compiled on first use.
+    """
+    if 'plan' not in _JIT:
+        try:
+            from numba import njit
+            from numba.core.errors import NumbaError
+            _JIT.update(plan=njit(cache=True)(_yank_plan), errors=NumbaError)
+        except ImportError:
+            _JIT.update(plan=None, errors=())
+    return _JIT['plan'], _JIT['errors']
+
+
+def _remove_snakes(boxes, offsets):
+    """
+    Removes the snakes of a diagram, working in place on its lists of boxes
+    and offsets rather than building diagrams.
+    """
+    for move, i, j in _snake_plan(boxes, offsets):
+        if move == _INTERCHANGE:
+            _interchange_inplace(boxes, offsets, i, j)
+        else:
+            del boxes[i:j + 1], offsets[i:j + 1]
+
+
+_INTERCHANGE, _YANK = 0, 1
+
+
+def _yank_plan(offsets, dom_len, cod_len, kind):
+    """
+    Plans the removal of snakes given integer arrays for the offsets, the
+    lengths of domain and codomain and the :attr:`Box._kind` of each box.
+    The arrays are rewritten in place, together with the index :code:`keys`
+    of each box in the original diagram.
+
+    Whether a cap can be yanked only depends on which box each of its wires
+    ends on, so a cap that cannot be yanked is marked as blocked until the cup
+    one of its wires ends on gets yanked. This way each pass only follows the
+    wires of the caps that are new candidates.
+
+    This only uses integers and lists so that it can be compiled with
+    :code:`numba.njit`, see :func:`_yank_plan_jit`.
+
+    Returns
+    -------
+    plan : list of tuple
+        The list of :code:`(_INTERCHANGE, i, j)` and :code:`(_YANK, cap, cup)`
+        steps, it stops right after an interchange that cannot be applied.
+    """
+    # Lists are built with comprehensions, even empty ones such as
+    # [0 for _ in range(0)], so that numba can infer their item types.
+    length = len(offsets)
+    keys = [key for key in range(length)]
+    blocked = [False for _ in range(length)]
+    ends = [-1 for _ in range(2 * length)]  # where the wires of caps end.
+    plan = [(_INTERCHANGE, 0, 0) for _ in range(0)]
+    while True:
+        found, cap, cup, left_snake = False, 0, 0, False
+        left_obstruction = [0 for _ in range(0)]
+        right_obstruction = [0 for _ in range(0)]
+        for index in range(length):
+            if kind[index] != 2 or blocked[keys[index]]:
+                continue
+            for wire in range(2):  # follow the left then right wire.
+                i, j, cup = index, offsets[index] + wire, length
+                left_obstruction = [0 for _ in range(0)]
+                right_obstruction = [0 for _ in range(0)]
+                while i < length - 1:
+                    i += 1
+                    if offsets[i] <= j < offsets[i] + dom_len[i]:
+                        cup = i
+                        break
+                    if offsets[i] <= j:
+                        j += cod_len[i] - dom_len[i]
+                        left_obstruction.append(i)
+                    else:
+                        right_obstruction.append(i)
+                ends[2 * keys[index] + wire] =\
+                    keys[cup] if cup < length else -1
+                left_snake = wire == 0
+                found = cup < length and kind[cup] == 1 and (
+                    offsets[cup] + 1 == j if left_snake else offsets[cup] == j)
+                if found:
+                    break
+            if found:
+                cap = index
+                break
+            blocked[keys[index]] = True
+        if not found:
+            return plan
+        # Both lists of obstructions are sorted, moving a left obstruction
+        # past a right one shifts the index of the latter by one.
+        shifted, below = [0 for _ in range(0)], 0
+        for box in right_obstruction:
+            while below < len(left_obstruction)\
+                    and left_obstruction[below] < box:
+                below += 1
+            shifted.append(box + len(left_obstruction) - below
+                           if left_snake else box - below)
+        moves = [(0, 0) for _ in range(0)]
+        if left_snake:
+            for box in left_obstruction:
+                moves.append((box, cap))
+                cap += 1
+            for box in shifted[::-1]:
+                moves.append((box, cup))
+                cup -= 1
+        else:
+            for box in left_obstruction[::-1]:
+                moves.append((box, cup))
+                cup -= 1
+            for box in shifted:
+                moves.append((box, cap))
+                cap += 1
+        for source, target in moves:
+            plan.append((_INTERCHANGE, source, target))
+            step = 1 if target > source else -1
+            for k in range(source, target, step):
+                k = min(k, k + step)
+                off0, off1 = offsets[k], offsets[k + 1]
+                if off0 >= off1 + dom_len[k + 1]:  # box0 right of box1
+                    off0 = off0 - dom_len[k + 1] + cod_len[k + 1]
+                elif off1 >= off0 + cod_len[k]:  # box0 left of box1
+                    off1 = off1 - cod_len[k] + dom_len[k]
+                else:  # the replay raises the InterchangerError.
+                    return plan
+                offsets[k], offsets[k + 1] = off1, off0
+                dom_len[k], dom_len[k + 1] = dom_len[k + 1], dom_len[k]
+                cod_len[k], cod_len[k + 1] = cod_len[k + 1], cod_len[k]
+                kind[k], kind[k + 1] = kind[k + 1], kind[k]
+                keys[k], keys[k + 1] = keys[k + 1], keys[k]
+        plan.append((_YANK, cap, cup))
+        yanked = keys[cup]
+        for key in range(len(blocked)):
+            if ends[2 * key] == yanked or ends[2 * key + 1] == yanked:
+                blocked[key] = False
+        length -= 2
+        for k in range(cap, length):
+            offsets[k], dom_len[k] = offsets[k + 2], dom_len[k + 2]
+            cod_len[k], kind[k] = cod_len[k + 2], kind[k + 2]
+            keys[k] = keys[k + 2]
+
+
+def _interchange_inplace(boxes, offsets, i, j):
+    """
+    Moves box i to position j in the lists of boxes and offsets,
+    applying the same rewrites as :meth:`monoidal.Diagram.interchange`.
+
+    Raises
+    ------
+    :class:`monoidal.InterchangerError`
+        Whenever two boxes that need to be interchanged are connected.
+    """
+    step = 1 if j > i else -1
+    for k in range(i, j, step):
+        k = min(k, k + step)
+        off0, off1 = offsets[k], offsets[k + 1]
+        box0, box1 = boxes[k], boxes[k + 1]
+        if off0 >= off1 + len(box1.dom):  # box0 right of box1
+            off0 = off0 - len(box1.dom) + len(box1.cod)
+        elif off1 >= off0 + len(box0.cod):  # box0 left of box1
+            off1 = off1 - len(box0.cod) + len(box0.dom)
+        else:
+            raise monoidal.InterchangerError(box0, box1)
+        boxes[k], boxes[k + 1] = box1, box0
+        offsets[k], offsets[k + 1] = off1, off0
 
 
 class Box(monoidal.Box, Diagram):
@@ -383,6 +667,9 @@ class Box(monoidal.Box, Diagram):
     >>> Box('f', a, b.l @ b, data={42})
     Box('f', Ty('a'), Ty(Ob('b', z=-1), 'b'), data={42})
     """
+    __slots__ = ('_name', '_dagger', '_data')
+    _kind = 0  # 1 for cups and 2 for caps, avoids isinstance in hot loops.
+
     def __init__(self, name, dom, cod, data=None, _dagger=False):
         """
         >>> a, b = Ty('a'), Ty('b')
@@ -399,6 +686,8 @@ class Id(Diagram):
     >>> t = Ty('a', 'b', 'c')
     >>> assert Id(t) == Diagram(t, t, [], [])
     """
+    __slots__ = ()
+
     def __init__(self, t):
         super().__init__(t, t, [], [], layers=cat.Id(t))
 
@@ -425,6 +714,9 @@ class Cup(Box):
     >>> Cup(n, n.r)
     Cup(Ty('n'), Ty(Ob('n', z=1)))
     """
+    __slots__ = ()
+    _kind = 1
+
     def __init__(self, x, y):
         if not isinstance(x, Ty):
             raise TypeError(messages.type_err(Ty, x))
@@ -438,6 +730,19 @@ class Cup(Box):
             raise NotImplementedError(messages.pivotal_not_implemented())
         super().__init__('CUP', x @ y, Ty())
 
+    @classmethod
+    def _unchecked(cls, x, y):
+        """
+        Builds the cup of two simple types without checking adjointness,
+        for callers which have already done so.
+
+        >>> n = Ty('n')
+        >>> assert Cup._unchecked(n, n.r) == Cup(n, n.r)
+        """
+        result = cls.__new__(cls)
+        Box.__init__(result, 'CUP', x @ y, Ty())
+        return result
+
     def dagger(self):
         raise NotImplementedError(messages.pivotal_not_implemented())
 
@@ -465,6 +770,9 @@ class Cap(Box):
     >>> print(Cap(n.l, n.l.l).cod)
     n.l @ n.l.l
     """
+    __slots__ = ()
+    _kind = 2
+
     def __init__(self, x, y):
         if not isinstance(x, Ty):
             raise TypeError(messages.type_err(Ty, x))
@@ -478,6 +786,19 @@ class Cap(Box):
             raise NotImplementedError(messages.pivotal_not_implemented())
         super().__init__('CAP', Ty(), x @ y)
 
+    @classmethod
+    def _unchecked(cls, x, y):
+        """
+        Builds the cap of two simple types without checking adjointness,
+        for callers which have already done so.
+
+        >>> n = Ty('n')
+        >>> assert Cap._unchecked(n, n.l) == Cap(n, n.l)
+        """
+        result = cls.__new__(cls)
+        Box.__init__(result, 'CAP', Ty(), x @ y)
+        return result
+
     def dagger(self):
         raise NotImplementedError(messages.pivotal_not_implemented())
 
@@ -513,6 +834,12 @@ class Functor(monoidal.Functor):
     >>> F = Functor(ob, ar)
     >>> sentence = Alice @ loves @ Bob >> Cup(n, n.r) @ Id(s) @ Cup(n.l, n)
     >>> assert F(sentence).normal_form() == Alice >> Id(n) @ Bob >> love_box
+
+    The dispatch on each layer of a diagram is traced once, then replayed for
+    every diagram with the same boxes and offsets. Only the dispatch is
+    cached, the images of boxes are looked up on every call.
+
+    >>> assert F(sentence) == F(sentence) and len(F._plan_cache) == 1
     """
     def __init__(self, ob, ar, ob_factory=Ty, ar_factory=Diagram):
         """
@@ -521,6 +848,31 @@ class Functor(monoidal.Functor):
         Id(Ty('y'))
         """
         super().__init__(ob, ar, ob_factory=ob_factory, ar_factory=ar_factory)
+        self._plan_cache = OrderedDict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Plans are keyed on the ids of boxes, only valid in this process.
+        state['_plan_cache'] = OrderedDict()
+        return state
+
+    def _plan(self, diagram):
+        """
+        Returns the list of instructions :code:`(kind, box, left, right)` for
+        each layer of a diagram, where kind is the :attr:`Box._kind` of box.
+        """
+        key = (diagram.dom, tuple(map(id, diagram._boxes)), diagram._offsets)
+        if key in self._plan_cache:
+            self._plan_cache.move_to_end(key)
+            return self._plan_cache[key]
+        plan = [(getattr(box, '_kind', 0), box,
+                 left if isinstance(left, Ty) else Ty(*left),
+                 right if isinstance(right, Ty) else Ty(*right))
+                for left, box, right in diagram.layers]
+        self._plan_cache[key] = plan  # which keeps the boxes alive.
+        if len(self._plan_cache) > _PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        return plan
 
     def __call__(self, diagram):
         """
@@ -531,6 +883,8 @@ class Functor(monoidal.Functor):
         >>> assert F(f.transpose_r()) == F(f).transpose_r()
         """
         if isinstance(diagram, Ty):
+            if self.ob_factory is Ty:  # concatenate once rather than sum.
+                return Ty(*chain.from_iterable(map(self, diagram.objects)))
             return sum([self(b) for b in diagram.objects], self.ob_factory())
         if isinstance(diagram, Ob) and not diagram.z:
             return self.ob[Ty(diagram.name)]
@@ -549,6 +903,78 @@ class Functor(monoidal.Functor):
         if isinstance(diagram, Cap):
             return self.ar_factory.caps(
                 self(diagram.cod[0]), self(diagram.cod[1]))
-        if isinstance(diagram, Diagram):
+        if isinstance(diagram, Box):
             return super().__call__(diagram)
+        if isinstance(diagram, Diagram):
+            result = self.ar_factory.id(self(diagram.dom))
+            for kind, box, left, right in self._plan(diagram):
+                if kind == 1:
+                    box = self.ar_factory.cups(*map(self, box.dom))
+                elif kind == 2:
+                    box = self.ar_factory.caps(*map(self, box.cod))
+                else:
+                    box = self(box)
+                result = result >> self.ar_factory.id(self(left)) @ box\
+                    @ self.ar_factory.id(self(right))
+            return result
         raise TypeError(messages.type_err(Diagram, diagram))
+
+    def map(self, diagrams, max_workers=None, mp_context=None):
+        """
+        Applies the functor to a batch of diagrams, in parallel processes.
+
+        Parameters
+        ----------
+        diagrams : iterable of :class:`Diagram`
+            The diagrams to apply the functor to.
+        max_workers : int, optional
+            Number of processes, :code:`os.cpu_count()` by default.
+        mp_context : multiprocessing context, optional
+            Used to start the processes, e.g.
+            :code:`multiprocessing.get_context('spawn')`, the platform's
+            default start method if :code:`None`.
+
+        Returns
+        -------
+        images : list
+            The image of each diagram, in order.
+
+        Note
+        ----
+        Functors which cannot be pickled, e.g. with lambdas as images, are
+        applied sequentially, as is any batch on a single worker. Otherwise
+        the functor is pickled once and loaded once in each worker.
+
+        >>> x, y = Ty('x'), Ty('y')
+        >>> f = Box('f', x, y)
+        >>> F = Functor({x: y, y: x}, {f: f[::-1]})
+        >>> diagrams = [f, f.transpose_l(), f.transpose_r()]
+        >>> assert F.map(diagrams, max_workers=2) == list(map(F, diagrams))
+        """
+        diagrams = list(diagrams)
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(diagrams) < 2:
+            return list(map(self, diagrams))
+        try:
+            data = pickle.dumps(self)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return list(map(self, diagrams))
+        chunksize = max(1, len(diagrams) // (4 * workers))
+        with ProcessPoolExecutor(
+                max_workers=workers, mp_context=mp_context,
+                initializer=_load_functor, initargs=(data, )) as executor:
+            return list(executor.map(
+                _apply_functor, diagrams, chunksize=chunksize))
+
+
+_WORKER = {}  # The functor of a worker process of :meth:`Functor.map`.
+
+
+def _load_functor(data):
+    """ Unpickles the functor once in each worker of :meth:`Functor.map`. """
+    _WORKER['functor'] = pickle.loads(data)
+
+
+def _apply_functor(diagram):
+    """ Applies the functor of a worker of :meth:`Functor.map`. """
+    return _WORKER['functor'](diagram)
@@ -66,6 +66,16 @@ def test_Arrow_init():
     assert str(err.value) == messages.type_err(Arrow, Ob('x'))
 
 
+def test_Arrow_boxes():
+    x, y = Ob('x'), Ob('y')
+    f = Box('f', x, y)
+    boxes = [f, f[::-1]]
+    arrow = Arrow(x, x, boxes)
+    boxes.append(f)
+    assert arrow.boxes == [f, f[::-1]] and arrow.boxes is not arrow.boxes
+    assert arrow[:1].boxes == f.boxes == [f]
+
+
 def test_Arrow_len():
     assert len(Arrow(Ob('x'), Ob('x'), [])) == 0
 
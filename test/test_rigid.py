@@ -1,4 +1,11 @@
-from pytest import raises
+import multiprocessing
+import os
+import subprocess
+import sys
+from pickle import dumps, loads
+import numpy as np
+from pytest import importorskip, raises
+from discopy import rigid
 from discopy.rigid import *
 
 
@@ -6,11 +13,17 @@ def test_Ob_init():
     with raises(TypeError) as err:
         Ob('x', z='y')
     assert str(err.value) == messages.type_err(int, 'y')
+    x_r = Ob('x', z=1)
+    with raises(TypeError) as err:
+        Ob('x', 1.0)
+    assert str(err.value) == messages.type_err(int, 1.0) and x_r.z == 1
     assert cat.Ob('x') == Ob('x')
 
 
 def test_Ob_eq():
     assert Ob('a') == Ob('a').l.r and Ob('a') != 'a'
+    assert Ob(['a']) == Ob(['a']) != Ob(['a'], z=1) != Ob(['b'], z=1)
+    assert Ob('a') == cat.Ob('a') and Ob('a').r != cat.Ob('a')
 
 
 def test_Ob_hash():
@@ -18,6 +31,14 @@ def test_Ob_hash():
     assert {a: 42}[a] == 42
 
 
+def test_Ob_interning():
+    a = Ob('a')
+    assert Ob('a') is a and a.l.r is a and Ob('a', z=1) is a.r
+    assert Ob(1) is not Ob(1.0) and Ob(['a']) == Ob(['a'])
+    q_r = Ob('q', True)
+    assert Ob('q', 1) is not q_r and repr(Ob('q', 1)) == "Ob('q', z=1)"
+
+
 def test_Ob_repr():
     assert repr(Ob('a', z=42)) == "Ob('a', z=42)"
 
@@ -27,6 +48,40 @@ def test_Ob_str():
     assert str(a) == "a" and str(a.r) == "a.r" and str(a.l) == "a.l"
 
 
+def test_Ty_adjoints():
+    t = Ty('n', 's')
+    assert t.l is t.l and t.r.l is t and t.l.l.r.r == t
+    assert hash(t) == hash(Ty('n', 's'))
+
+
+def test_Ty_pickle():
+    a, b = Ty('a'), Ty('b')
+    f = Box('f', a, b.l @ b)
+    assert loads(dumps(a.r[0])) is a.r[0]
+    assert loads(dumps(f)) == f and loads(dumps(Cup(a, a.r))) == Cup(a, a.r)
+
+
+def test_Ty_pickle_hash_seed():
+    dump = "import pickle, sys\n"\
+        "from discopy.rigid import Ty\n"\
+        "sys.stdout.buffer.write(pickle.dumps((Ty('x', 'y'), {Ty('x'): 1})))"
+    load = "import pickle, sys\n"\
+        "from discopy import cat\n"\
+        "from discopy.rigid import Ob, Ty\n"\
+        "t, d = pickle.loads(sys.stdin.buffer.read())\n"\
+        "assert {Ty('x', 'y'): 1}.get(t) == d.get(Ty('x')) == 1\n"\
+        "assert t[0] is Ob('x') and cat.Ob('x') in {Ob('x')}\n"\
+        "assert hash(Ob('x')) == hash('x')"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    data = subprocess.run(
+        [sys.executable, '-c', dump], env=dict(env, PYTHONHASHSEED='1'),
+        stdout=subprocess.PIPE, check=True).stdout
+    subprocess.run(
+        [sys.executable, '-c', load], env=dict(env, PYTHONHASHSEED='2'),
+        input=data, check=True)
+
+
 def test_PRO_r():
     assert PRO(2).r == PRO(2)
 
@@ -38,6 +93,26 @@ def test_Diagram_cups():
     with raises(TypeError) as err:
         Diagram.cups(Ty('x'), 'x')
     assert str(err.value) == messages.type_err(Ty, 'x')
+    x, y = Ty('x'), Ty('y')
+    with raises(AxiomError) as err:
+        Diagram.cups(x @ y, x.r @ y.r)
+    assert str(err.value) == messages.are_not_adjoints(y, x.r)
+    with raises(NotImplementedError) as err:
+        Diagram.cups(PRO(1), PRO(1))
+    assert str(err.value) == messages.pivotal_not_implemented()
+
+
+def test_Diagram_cups_and_caps_layers():
+    a, b, c = Ty('a'), Ty('b'), Ty('c')
+    cups = Id(a @ b) @ Cup(c, c.r) @ Id(b.r @ a.r)\
+        >> Id(a) @ Cup(b, b.r) @ Id(a.r) >> Cup(a, a.r)
+    caps = Cap(a, a.l) >> Id(a) @ Cap(b, b.l) @ Id(a.l)\
+        >> Id(a @ b) @ Cap(c, c.l) @ Id(b.l @ a.l)
+    t = a @ b @ c
+    assert Diagram.cups(t, t.r) == cups
+    assert list(Diagram.cups(t, t.r).layers) == list(cups.layers)
+    assert Diagram.caps(t, t.l) == caps
+    assert list(Diagram.caps(t, t.l).layers) == list(caps.layers)
 
 
 def test_Diagram_caps():
@@ -47,6 +122,13 @@ def test_Diagram_caps():
     with raises(TypeError) as err:
         Diagram.caps(Ty('x'), 'x')
     assert str(err.value) == messages.type_err(Ty, 'x')
+    x, y = Ty('x'), Ty('y')
+    with raises(AxiomError) as err:
+        Diagram.caps(x @ y, x.l @ y.l)
+    assert str(err.value) == messages.are_not_adjoints(x, y.l)
+    with raises(NotImplementedError) as err:
+        Diagram.caps(PRO(1), PRO(1))
+    assert str(err.value) == messages.pivotal_not_implemented()
 
 
 def test_Diagram_normal_form():
@@ -67,6 +149,46 @@ def test_Diagram_normal_form():
     assert str(err.value) == messages.is_not_connected(Eckmann_Hilton)
 
 
+def test_Diagram_normal_form_last_step():
+    a, b, c = Ty('a'), Ty('b'), Ty('c')
+    f, g = Box('f', a @ b, c), Box('g', c, a.l @ b)
+    diagram = (f >> g).transpose_l().transpose_l().transpose_r().transpose_r()
+    for left in [False, True]:
+        *_, last_step = diagram.normalize(left=left)
+        assert diagram.normal_form(left=left) == last_step == f >> g
+
+
+def test_Diagram_normal_form_cache():
+    x = Ty('x')
+    diagram = Id(x).transpose_l().transpose_r()
+    assert diagram.normal_form() is diagram.normal_form()
+    assert diagram.normal_form(left=True) == Id(x)
+    f = Box('f', x, x)
+    assert (f @ Id(x)).normal_form() == f @ Id(x) != f == f.normal_form()
+
+
+def test_yank_plan_jit():
+    importorskip('numba')
+    x = Ty(*map(str, range(10)))
+    for diagram in [Id(x).transpose_l(), Id(x @ x.r).transpose_r() @ Id(x)]:
+        tags = (diagram.offsets, [len(box.dom) for box in diagram.boxes],
+                [len(box.cod) for box in diagram.boxes],
+                [box._kind for box in diagram.boxes])
+        jit, _ = rigid._yank_plan_jit()
+        arrays = [np.array(tag, dtype=np.int64) for tag in tags]
+        assert list(map(tuple, jit(*arrays))) == rigid._yank_plan(*tags)
+
+
+def test_Diagram_normal_form_jit_fallback(monkeypatch):
+    def fail(*_):
+        raise ValueError
+    monkeypatch.setitem(rigid._JIT, 'plan', fail)
+    monkeypatch.setitem(rigid._JIT, 'errors', ValueError)
+    x = Ty(*map(str, range(rigid._JIT_MIN_BOXES // 2)))
+    assert Id(x).transpose_l().normal_form() == Id(x.l)
+    assert rigid._JIT['plan'] is None
+
+
 def test_Cup_init():
     with raises(TypeError):
         Cup('x', Ty('y'))
@@ -123,3 +245,42 @@ def test_Functor_call():
     F = Functor({}, {})
     with raises(TypeError):
         F(F)
+    box = monoidal.Box('f', monoidal.Ty('x'), monoidal.Ty('y'))
+    with raises(TypeError) as err:
+        F(box)
+    assert str(err.value) == messages.type_err(Diagram, box)
+    x, y, z = Ty('x'), Ty('y'), Ty('z')
+    F = Functor({x: y @ z, y: Ty(), z: monoidal.Ty('x')}, {})
+    assert F(x.l @ y @ z) == z.l @ y.l @ x and F(Ty()) == Ty()
+
+
+def test_Functor_plan_cache():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y, x)
+    ar = {f: g, g: f}
+    F, diagram = Functor({x: y, y: x}, ar), f.transpose_l()
+    assert F(diagram) == F(diagram) == g.transpose_l()
+    ar[f] = g >> f >> g
+    assert F(diagram) == (g >> f >> g).transpose_l()
+    assert len(F._plan_cache) == 1
+
+
+def test_Functor_map():
+    x, y = Ty('x'), Ty('y')
+    f = Box('f', x, y)
+    F = Functor({x: y, y: x}, {f: f[::-1]})
+    diagrams = [f.transpose_l(), f.transpose_r(), f]
+    F(diagrams[0])
+    assert not loads(dumps(F))._plan_cache
+    assert F.map(iter(diagrams), max_workers=2) == list(map(F, diagrams))
+    G = Functor({x: y, y: x}, {f: Box('g', y, x, data=lambda: 42)})
+    assert G.map(diagrams, max_workers=2) == list(map(G, diagrams))
+    assert F.map([]) == [] and F.map([f], max_workers=1) == [F(f)]
+    spawn = multiprocessing.get_context('spawn')
+    assert F.map(diagrams, max_workers=2, mp_context=spawn)\
+        == list(map(F, diagrams))
+    assert G.map(diagrams, max_workers=2, mp_context=spawn)\
+        == list(map(G, diagrams))
+    with raises(TypeError) as err:
+        F.map([f, 'f'], max_workers=2)
+    assert str(err.value) == messages.type_err(Diagram, 'f')